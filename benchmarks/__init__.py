@@ -0,0 +1,6 @@
+"""
+Benchmarks for the server, catalog search and CSV converter hot paths.
+
+Run everything with ``python -m benchmarks``; see ``python -m benchmarks --help``.
+No display or network access is needed.
+"""
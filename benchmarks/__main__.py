@@ -0,0 +1,91 @@
+import argparse
+import json
+import platform
+import sys
+import time
+
+from . import converter_bench, search_bench, server_bench
+
+SUITES = ["server", "search", "converter"]
+
+
+def compare(results, baseline, max_regression):
+    """Prints each metric's change against the baseline; returns the names that regressed."""
+    baseline_values = {entry["name"]: entry["value"] for entry in baseline["results"]}
+    regressions = []
+    for entry in results:
+        old = baseline_values.get(entry["name"])
+        if old is None:
+            continue
+        new = entry["value"]
+        if old == 0:
+            change = 0.0 if new == 0 else float("inf")
+        else:
+            change = (new - old) / old * 100
+        # Positive "worse" means the metric moved in the wrong direction
+        worse = -change if entry["better"] == "higher" else change
+        flag = ""
+        if worse > max_regression:
+            flag = "  REGRESSION"
+            regressions.append(entry["name"])
+        print(f"{entry['name']:<40} {old:12.3f} -> {new:12.3f} {entry['unit']:<7} {change:+7.1f}%{flag}")
+    return regressions
+
+
+def main(argv=None):
+    """Runs the selected benchmark suites and writes machine-readable results."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--only", choices=SUITES, action="append",
+                        help="Run only this suite (repeatable). Default: all")
+    parser.add_argument("--duration", type=float, default=5.0,
+                        help="Seconds of load per server scenario")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Concurrent clients for the server suite")
+    parser.add_argument("--no-keep-alive", action="store_true",
+                        help="Benchmark the default HTTP/1.0 server, one connection per request")
+    parser.add_argument("--scales", default=",".join(str(s) for s in search_bench.DEFAULT_SCALES),
+                        help="Comma-separated catalog sizes for the search suite")
+    parser.add_argument("--rows", type=int, default=converter_bench.DEFAULT_ROWS,
+                        help="Rows in the generated CSV for the converter suite")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against a results file from an earlier run")
+    parser.add_argument("--max-regression", type=float, default=10.0,
+                        help="Percent change in the wrong direction that counts as a regression")
+    args = parser.parse_args(argv)
+
+    suites = args.only or SUITES
+    results = []
+    if "server" in suites:
+        results += server_bench.run(args.concurrency, args.duration, not args.no_keep_alive)
+    if "search" in suites:
+        results += search_bench.run([int(s) for s in args.scales.split(",") if s])
+    if "converter" in suites:
+        results += converter_bench.run(args.rows)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "suites": suites,
+            "keep_alive": not args.no_keep_alive,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than {args.max_regression}%")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
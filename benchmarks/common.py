@@ -0,0 +1,34 @@
+import random
+
+# Vocabulary for synthetic catalog descriptions, in the spirit of ui/web/items.json
+WORDS = [
+    "Potato", "Protein", "Lamb", "Meal", "Tapioca", "Starch", "Pea", "ISO",
+    "Brown", "Rice", "Fruit", "Veggie", "Split", "Peas", "Low", "Ash",
+    "Chicken", "Salmon", "Oil", "Flax", "Seed", "Oat", "Groats", "Barley",
+    "Beet", "Pulp", "Dried", "Egg", "Product", "Turkey", "Duck", "Pellets",
+]
+
+
+def percentile(sorted_values, pct):
+    """Returns the pct-th percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def synthetic_items(count, seed=0):
+    """Generates count catalog items with unique GRDs and random descriptions."""
+    rng = random.Random(seed)
+    return [
+        {
+            "grd": str(1000000 + i),
+            "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 4))),
+        }
+        for i in range(count)
+    ]
+
+
+def metric(name, value, unit, better):
+    """Builds one result entry; better is 'higher' or 'lower'."""
+    return {"name": name, "value": value, "unit": unit, "better": better}
@@ -0,0 +1,59 @@
+import csv
+import os
+import random
+import tempfile
+import time
+
+from .common import WORDS, metric
+
+DEFAULT_ROWS = 200000
+
+
+def _write_csv(path, rows, seed=0):
+    """Writes a CSV shaped like a price list export."""
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["grd", "description", "price_kg", "price_lb", "shelf_life_days", "notes"])
+        for i in range(rows):
+            writer.writerow([
+                1000000 + i,
+                " ".join(rng.choice(WORDS) for _ in range(3)),
+                f"{rng.uniform(0.5, 20):.2f}",
+                f"{rng.uniform(0.2, 9):.2f}",
+                rng.randint(30, 720),
+                "Keep dry, \"sealed\"" if i % 10 == 0 else "",
+            ])
+
+
+def run(rows=DEFAULT_ROWS, repeat=3):
+    """Measures CSVConverterThread.convert_csv throughput on a generated CSV."""
+    try:
+        from ui.csv2json import CSVConverterThread
+    except ImportError as e:
+        # PyQt5 is an optional dependency for headless benchmark runs
+        print(f"converter skipped: {e}")
+        return []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = os.path.join(tmp_dir, "bench.csv")
+        output_path = os.path.join(tmp_dir, "bench_converted.txt")
+        _write_csv(input_path, rows)
+        size_mb = os.path.getsize(input_path) / (1024 * 1024)
+        # The thread is never started; convert_csv is called directly
+        converter = CSVConverterThread(tmp_dir, tmp_dir)
+
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            converter.convert_csv(input_path, output_path)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+    mb_per_s = size_mb / best
+    rows_per_s = rows / best # The header row is not counted
+    print(f"converter {rows} rows ({size_mb:.1f} MB)  {mb_per_s:8.1f} MB/s  {rows_per_s:12.0f} rows/s")
+    return [
+        metric("converter.mb_per_s", mb_per_s, "MB/s", "higher"),
+        metric("converter.rows_per_s", rows_per_s, "rows/s", "higher"),
+    ]
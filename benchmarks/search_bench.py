@@ -0,0 +1,44 @@
+import timeit
+
+from core.catalog import Catalog
+from .common import metric, synthetic_items
+
+# One metric per query: a GRD prefix, common and rare description words, and a miss
+QUERIES = [
+    ("grd_prefix", "1000"),
+    ("common_word", "pea"),
+    ("rare_word", "groats"),
+    ("no_match", "zzz-no-match"),
+]
+DEFAULT_SCALES = [10000, 100000, 1000000]
+# Samples per measurement; the best one is reported, as timeit recommends,
+# since slower samples only add noise from the rest of the machine
+SAMPLES = 7
+BUILD_SAMPLES = 3
+
+
+def _best_time(func, samples):
+    """Best per-call time of func, batching calls so each sample runs at least 0.2 s."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange() # Also serves as the warm-up
+    return min(timer.repeat(repeat=samples, number=number)) / number
+
+
+def run(scales=DEFAULT_SCALES, limit=8):
+    """Times index building and each query at each synthetic catalog size."""
+    results = []
+    for scale in scales:
+        items = synthetic_items(scale)
+        build_ms = min(
+            timeit.repeat(lambda: Catalog("build", items=items), repeat=BUILD_SAMPLES, number=1)
+        ) * 1000
+        print(f"search {scale:>9} items  build {build_ms:9.1f} ms (best of {BUILD_SAMPLES})")
+        results.append(metric(f"search.{scale}.build_ms", build_ms, "ms", "lower"))
+
+        catalog = Catalog(f"synthetic-{scale}", items=items)
+        for label, query in QUERIES:
+            query_ms = _best_time(lambda: catalog.search(query, limit), SAMPLES) * 1000
+            print(f"search {scale:>9} items  {label:<12} {query_ms:10.4f} ms (best of {SAMPLES})")
+            results.append(metric(f"search.{scale}.{label}_ms", query_ms, "ms", "lower"))
+        del catalog, items
+    return results
@@ -0,0 +1,108 @@
+import contextlib
+import http.client
+import io
+import json
+import os
+import multiprocessing
+import tempfile
+import time
+
+from core.server_manager import ServerManager
+from .common import metric, percentile, synthetic_items
+
+# Paths hit by the load generator, one scenario each
+SCENARIOS = [
+    ("index", "/"),
+    ("search", "/api/search?q=pea"),
+    ("catalog_search", "/c/bench/api/search?q=chicken&limit=50"),
+    ("stylesheet", "/style.css"),
+]
+BENCH_CATALOG_SIZE = 100000
+
+
+def _client(args):
+    """Sends requests over one connection for duration seconds, in a client process."""
+    port, path, duration = args
+    latencies = []
+    errors = 0
+    # Kept open with keep-alive; otherwise http.client reconnects after each response
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    started = time.perf_counter()
+    deadline = started + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+                continue
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+    return latencies, errors, time.perf_counter() - started
+
+
+def load(pool, port, path, concurrency, duration):
+    """Drives path with concurrency clients, each in its own pool process, for duration seconds."""
+    runs = pool.map(_client, [(port, path, duration)] * concurrency, chunksize=1)
+    latencies = sorted(latency for run_latencies, _, _ in runs for latency in run_latencies)
+    elapsed = max(run_elapsed for _, _, run_elapsed in runs)
+    return {
+        "requests": len(latencies),
+        "errors": sum(run_errors for _, run_errors, _ in runs),
+        "req_per_s": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def run(concurrency=4, duration=5.0, keep_alive=True):
+    """
+    Starts ServerManager on loopback and load-tests each scenario.
+
+    With keep_alive the server speaks HTTP/1.1 and each client reuses one
+    connection; without it every request pays for a new connection, as in
+    the GUI's default HTTP/1.0 server. The clients run in separate processes
+    so their CPU time and GIL waits don't count against the server.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        catalog_path = os.path.join(tmp_dir, "bench.json")
+        with open(catalog_path, "w", encoding="utf-8") as f:
+            json.dump(synthetic_items(BENCH_CATALOG_SIZE), f)
+
+        # Port 0 picks a free port; the handler's per-request log lines go to stderr
+        server = ServerManager(
+            port=0, host="127.0.0.1", catalogs={"bench": catalog_path}, keep_alive=keep_alive
+        )
+        server.start_server()
+        if not server.httpd:
+            raise RuntimeError("Benchmark server failed to start")
+        # Spawned rather than forked, so the clients don't inherit the server's threads
+        pool = multiprocessing.get_context("spawn").Pool(concurrency)
+        try:
+            with contextlib.redirect_stderr(io.StringIO()):
+                for name, path in SCENARIOS:
+                    load(pool, server.port, path, 1, 0.2) # Warm up: loads catalogs, builds the bundle
+                    stats = load(pool, server.port, path, concurrency, duration)
+                    print(
+                        f"server {name:<15} {stats['req_per_s']:10.1f} req/s  "
+                        f"p50 {stats['p50_ms']:7.2f} ms  p99 {stats['p99_ms']:7.2f} ms  "
+                        f"errors {stats['errors']}"
+                    )
+                    results += [
+                        metric(f"server.{name}.req_per_s", stats["req_per_s"], "req/s", "higher"),
+                        metric(f"server.{name}.p50_ms", stats["p50_ms"], "ms", "lower"),
+                        metric(f"server.{name}.p99_ms", stats["p99_ms"], "ms", "lower"),
+                        metric(f"server.{name}.errors", stats["errors"], "count", "lower"),
+                    ]
+        finally:
+            pool.close()
+            pool.join()
+            server.stop_server()
+    return results
@@ -0,0 +1,274 @@
+import base64
+import json
+import mimetypes
+import os
+import re
+import threading
+
+# Assets at or below this size are inlined as data: URIs, larger ones stay as links
+INLINE_ASSET_LIMIT = 32 * 1024
+# Number of catalog items embedded in the page so the first paint needs no fetch
+PRELOAD_PAGE_SIZE = 200
+
+_STYLESHEET_RE = re.compile(r'<link\s+rel="stylesheet"\s+href="([^"]+)"\s*/?>', re.IGNORECASE)
+_SCRIPT_RE = re.compile(r'<script\s+src="([^"]+)"\s*>\s*</script>', re.IGNORECASE)
+_ASSET_ATTR_RE = re.compile(r'\b(src|href)="(assets/[^"]+)"', re.IGNORECASE)
+_HEAD_CLOSE_RE = re.compile(r'</head>', re.IGNORECASE)
+# Whitespace next to these is never significant; ':' and '>' are left alone
+# because "a :hover" and "a:hover" are different selectors
+_CSS_TIGHT_CHARS = '{};,'
+
+
+def _skip_string(text, i):
+    """Returns the index just past the quoted string starting at text[i]."""
+    quote = text[i]
+    i += 1
+    while i < len(text) and text[i] != quote:
+        i += 2 if text[i] == '\\' else 1
+    return i + 1
+
+
+def minify_css(css):
+    """
+    Strips comments and redundant whitespace from a stylesheet.
+
+    Quoted strings are copied untouched, and whitespace is only dropped next to
+    { } ; and , so selectors and values keep their meaning.
+    """
+    out = []
+    pending_space = False
+    i = 0
+    while i < len(css):
+        char = css[i]
+        if char in '"\'':
+            end = _skip_string(css, i)
+            token = css[i:end]
+            i = end
+        elif css.startswith('/*', i):
+            end = css.find('*/', i + 2)
+            i = len(css) if end == -1 else end + 2
+            pending_space = True # A comment separates tokens like whitespace does
+            continue
+        elif char.isspace():
+            pending_space = True
+            i += 1
+            continue
+        else:
+            token = char
+            i += 1
+        if pending_space and out and out[-1][-1] not in _CSS_TIGHT_CHARS and token not in _CSS_TIGHT_CHARS:
+            out.append(' ')
+        pending_space = False
+        if token == '}' and out and out[-1] == ';':
+            out.pop() # The last declaration in a block needs no semicolon
+        out.append(token)
+    return ''.join(out)
+
+
+def _scan_js_line(line, in_template, in_block_comment):
+    """
+    Tracks template literal and block comment state across one line of JavaScript.
+
+    Returns (in_template, in_block_comment) at the end of the line. Regex
+    literals are not recognised; script.js has none containing quotes.
+    """
+    quote = '`' if in_template else None
+    i = 0
+    while i < len(line):
+        if in_block_comment:
+            end = line.find('*/', i)
+            if end == -1:
+                return False, True
+            in_block_comment = False
+            i = end + 2
+            continue
+        char = line[i]
+        if quote:
+            if char == '\\':
+                i += 1
+            elif char == quote:
+                quote = None
+        elif line.startswith('//', i):
+            break
+        elif line.startswith('/*', i):
+            in_block_comment = True
+            i += 1
+        elif char in '\'"`':
+            quote = char
+        i += 1
+    return quote == '`', in_block_comment
+
+
+def minify_js(js):
+    """
+    Conservatively minifies JavaScript.
+
+    Only whole-line comments, indentation and blank lines are removed; line
+    breaks are kept so automatic semicolon insertion behaves exactly as in the
+    original source. Lines inside multi-line template literals are kept as is.
+    """
+    lines = []
+    in_template = False
+    in_block_comment = False
+    for line in js.splitlines():
+        if in_template:
+            # Template literal content, whitespace and all
+            lines.append(line)
+            in_template, in_block_comment = _scan_js_line(line, True, False)
+            continue
+        stripped = line.strip()
+        if in_block_comment:
+            end = stripped.find('*/')
+            if end == -1:
+                continue
+            in_block_comment = False
+            stripped = stripped[end + 2:].strip()
+        if not stripped or stripped.startswith('//'):
+            continue
+        if stripped.startswith('/*'):
+            end = stripped.find('*/', 2)
+            if end == -1:
+                in_block_comment = True
+                continue
+            if not stripped[end + 2:].strip():
+                continue
+        in_template, in_block_comment = _scan_js_line(stripped, False, False)
+        if in_template:
+            # Trailing whitespace on this line belongs to the template literal
+            stripped = line.lstrip()
+        lines.append(stripped)
+    return '\n'.join(lines)
+
+
+def _data_uri(path):
+    """Returns the contents of a file encoded as a data: URI."""
+    mime_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    if path.lower().endswith('.ico'):
+        mime_type = 'image/x-icon'
+    with open(path, 'rb') as f:
+        encoded = base64.b64encode(f.read()).decode('ascii')
+    return f"data:{mime_type};base64,{encoded}"
+
+
+def _script_safe(text):
+    """Prevents inlined text from closing the surrounding <script>/<style> tag."""
+    return text.replace('</', '<\\/')
+
+
+class AssetBundler:
+    """
+    Builds a single-request index.html with its CSS, JS and small assets inlined.
+
+    The bundle is cached in memory and rebuilt whenever one of its source files
+    changes on disk, so edits to the web UI show up without restarting the server.
+    """
+
+    def __init__(self, serve_directory, page='index.html', preload_items=True):
+        """Initializes the AssetBundler."""
+        self.serve_directory = serve_directory
+        self.page = page
+        self.preload_items = preload_items
+        self._lock = threading.Lock()
+        self._bundle = None
+        self._source_mtimes = {}
+
+    def _path(self, relative_path):
+        return os.path.join(self.serve_directory, *relative_path.split('/'))
+
+    def _read_text(self, relative_path):
+        path = self._path(relative_path)
+        self._track(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def _track(self, path):
+        try:
+            self._source_mtimes[path] = os.path.getmtime(path)
+        except OSError:
+            self._source_mtimes[path] = None
+
+    def _is_stale(self):
+        for path, mtime in self._source_mtimes.items():
+            try:
+                current = os.path.getmtime(path)
+            except OSError:
+                current = None
+            if current != mtime:
+                return True
+        return False
+
+    def _inline_stylesheet(self, match):
+        href = match.group(1)
+        try:
+            css = minify_css(self._read_text(href))
+        except OSError:
+            return match.group(0)
+        return f"<style>{_script_safe(css)}</style>"
+
+    def _inline_script(self, match):
+        src = match.group(1)
+        try:
+            js = minify_js(self._read_text(src))
+        except OSError:
+            return match.group(0)
+        return f"<script>{_script_safe(js)}</script>"
+
+    def _inline_asset(self, match):
+        attr, relative_path = match.groups()
+        path = self._path(relative_path)
+        self._track(path)
+        if not os.path.isfile(path) or os.path.getsize(path) > INLINE_ASSET_LIMIT:
+            return match.group(0)
+        return f'{attr}="{_data_uri(path)}"'
+
+    def _favicon_link(self):
+        path = self._path('assets/favicon.ico')
+        self._track(path)
+        if os.path.isfile(path) and os.path.getsize(path) <= INLINE_ASSET_LIMIT:
+            return f'<link rel="icon" href="{_data_uri(path)}">'
+        return ''
+
+    def _preload_script(self):
+        """Embeds the first page of items.json so the search works before any fetch."""
+        path = self._path('items.json')
+        self._track(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                items = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Could not preload items for bundle: {e}")
+            return ''
+        if not isinstance(items, list):
+            print("WARNING: Could not preload items for bundle: items.json must be a JSON list of items")
+            return ''
+        payload = {
+            'items': items[:PRELOAD_PAGE_SIZE],
+            'complete': len(items) <= PRELOAD_PAGE_SIZE,
+        }
+        data = json.dumps(payload, separators=(',', ':'))
+        return f"<script>window.PRELOADED_ITEMS={_script_safe(data)};</script>"
+
+    def build(self):
+        """Builds the bundled page from the files currently on disk."""
+        self._source_mtimes = {}
+        html = self._read_text(self.page)
+        html = _STYLESHEET_RE.sub(self._inline_stylesheet, html)
+        html = _ASSET_ATTR_RE.sub(self._inline_asset, html)
+
+        head_extra = self._favicon_link()
+        if self.preload_items:
+            head_extra += self._preload_script()
+        if head_extra:
+            html = _HEAD_CLOSE_RE.sub(lambda m: head_extra + m.group(0), html, count=1)
+
+        # Scripts last so the preload payload is defined before script.js runs
+        html = _SCRIPT_RE.sub(self._inline_script, html)
+        return html.encode('utf-8')
+
+    def get_bundle(self):
+        """Returns the bundled page, rebuilding it first if a source file changed."""
+        with self._lock:
+            if self._bundle is None or self._is_stale():
+                self._bundle = self.build()
+                print(f"Bundled {self.page} ({len(self._bundle)} bytes)")
+            return self._bundle
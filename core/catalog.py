@@ -0,0 +1,305 @@
+import json
+import mmap
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+# Default memory budget for all resident catalog indexes combined
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+# Same cap the web UI uses for its suggestion list
+DEFAULT_SEARCH_LIMIT = 8
+
+
+# Field separator in packed catalog files; JSON never emits it unescaped
+_FIELD_SEP = b'\x1f'
+
+
+def read_items(path, name):
+    """Reads an items.json style file, raising ValueError unless it is a list of objects."""
+    with open(path, 'r', encoding='utf-8') as f:
+        items = json.load(f)
+    if not isinstance(items, list):
+        raise ValueError(f"Catalog {name} must be a JSON list of items")
+    if not all(isinstance(item, dict) for item in items):
+        raise ValueError(f"Catalog {name} must only contain JSON objects")
+    return items
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def _estimate_size(items, index):
+    """Roughly estimates the resident size of a catalog's items and index in bytes."""
+    size = sys.getsizeof(items) + sys.getsizeof(index)
+    for item in items:
+        size += sys.getsizeof(item)
+        for key, value in item.items():
+            size += sys.getsizeof(key) + sys.getsizeof(value)
+    for entry in index:
+        size += sys.getsizeof(entry) + sys.getsizeof(entry[0]) + sys.getsizeof(entry[1])
+    return size
+
+
+class Catalog:
+    """A searchable item catalog backed by an items.json style file."""
+
+    def __init__(self, name, path=None, items=None):
+        """Initializes the Catalog. Items are read from path lazily unless given directly."""
+        self.name = name
+        self.path = path
+        self.source_path = path # The items.json style file clients can download
+        self.items = None
+        self.index = None
+        self.memory_size = 0
+        self.loaded_mtime = None
+        # Serializes loads of this catalog without blocking searches of the others
+        self.lock = threading.Lock()
+        if items is not None:
+            self._build_index(items)
+
+    @property
+    def loaded(self):
+        return self.index is not None
+
+    def is_stale(self):
+        """True when the catalog file changed since it was loaded."""
+        return self.path is not None and _mtime(self.path) != self.loaded_mtime
+
+    def load(self):
+        """Reads the catalog file and builds its search index."""
+        mtime = _mtime(self.path)
+        self._build_index(read_items(self.path, self.name))
+        self.loaded_mtime = mtime
+
+    def _build_index(self, items):
+        # Lower-cased fields are precomputed so a search doesn't redo it per item
+        self.items = items
+        self.index = [
+            (str(item.get('grd', '')).lower(), str(item.get('description', '')).lower(), item)
+            for item in items
+        ]
+        self.memory_size = _estimate_size(self.items, self.index)
+
+    def unload(self):
+        """Drops the items and index, keeping only what is needed to reload them."""
+        self.items = None
+        self.index = None
+        self.memory_size = 0
+
+    def __len__(self):
+        return len(self.index) if self.index is not None else 0
+
+    def search(self, term, limit=DEFAULT_SEARCH_LIMIT):
+        """
+        Returns up to limit items whose GRD starts with term or whose description contains it.
+
+        Matches the filtering done client-side in script.js.
+        """
+        return self.search_index(self.index, term, limit)
+
+    @staticmethod
+    def search_index(index, term, limit):
+        term = term.lower().strip()
+        if not term:
+            return []
+        results = []
+        for grd, description, item in index:
+            if grd.startswith(term) or term in description:
+                results.append(item)
+                if len(results) >= limit:
+                    break
+        return results
+
+
+def _search_key(value):
+    return str(value).lower().replace('\n', ' ').replace('\x1f', ' ').encode('utf-8')
+
+
+def write_packed_catalog(items, path):
+    """
+    Writes items to a packed catalog file for MappedCatalog.
+
+    Each line holds the lower-cased GRD, the lower-cased description and the
+    item as JSON, separated by \\x1f.
+    """
+    with open(path, 'wb') as f:
+        for item in items:
+            f.write(_search_key(item.get('grd', '')) + _FIELD_SEP)
+            f.write(_search_key(item.get('description', '')) + _FIELD_SEP)
+            f.write(json.dumps(item, separators=(',', ':')).encode('utf-8') + b'\n')
+
+
+class MappedCatalog:
+    """
+    A read-only catalog searched directly in a memory-mapped packed file.
+
+    The file's pages live in the OS page cache, so every process that maps the
+    same file shares a single copy instead of each holding its own index.
+    """
+
+    def __init__(self, name, path, source_path=None):
+        """Initializes the MappedCatalog. The file is mapped lazily."""
+        self.name = name
+        self.path = path
+        self.source_path = source_path
+        self.index = None
+        self.count = 0
+        self.memory_size = 0
+        self.loaded_mtime = None
+        self.lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self.index is not None
+
+    def is_stale(self):
+        """True when the source file changed since the packed file was mapped."""
+        return self.source_path is not None and _mtime(self.source_path) != self.loaded_mtime
+
+    def _repack(self):
+        # Written aside and renamed in, so processes still mapping the old file are unaffected
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        write_packed_catalog(read_items(self.source_path, self.name), temp_path)
+        os.replace(temp_path, self.path)
+
+    def load(self):
+        """Maps the packed catalog file into memory, repacking it first if the source is newer."""
+        source_mtime = _mtime(self.source_path) if self.source_path else None
+        packed_mtime = _mtime(self.path)
+        if source_mtime is not None and (packed_mtime is None or packed_mtime < source_mtime):
+            self._repack()
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            # mmap can't map an empty file; an empty bytes object searches the same way
+            self.index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        chunk = 1024 * 1024
+        self.count = sum(self.index[i:i + chunk].count(b'\n') for i in range(0, size, chunk))
+        self.memory_size = size
+        self.loaded_mtime = source_mtime
+
+    def unload(self):
+        # Not closed explicitly: a search still holding the map keeps it alive until it finishes
+        self.index = None
+        self.count = 0
+        self.memory_size = 0
+
+    def __len__(self):
+        return self.count
+
+    def search(self, term, limit=DEFAULT_SEARCH_LIMIT):
+        """Same matching as Catalog.search, done with substring scans over the mapped file."""
+        return self.search_index(self.index, term, limit)
+
+    @staticmethod
+    def search_index(index, term, limit):
+        needle = term.lower().strip().encode('utf-8')
+        if not needle or b'\n' in needle or _FIELD_SEP in needle:
+            return []
+        results = []
+        pos = index.find(needle)
+        while pos != -1 and len(results) < limit:
+            line_start = index.rfind(b'\n', 0, pos) + 1
+            line_end = index.find(b'\n', pos)
+            grd, description, item = index[line_start:line_end].split(_FIELD_SEP, 2)
+            # The hit may be inside the JSON part, so check the search fields properly
+            if grd.startswith(needle) or needle in description:
+                results.append(json.loads(item))
+            pos = index.find(needle, line_end + 1)
+        return results
+
+
+class CatalogRegistry:
+    """
+    Holds named catalogs, loading each on first use.
+
+    Loaded catalogs are kept in least-recently-used order and evicted once their
+    combined estimated size exceeds memory_budget. The catalog being used is
+    never evicted, so a single catalog larger than the budget still works.
+    A catalog whose file changed on disk is reloaded on its next use.
+    """
+
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET):
+        """Initializes the CatalogRegistry."""
+        self.memory_budget = memory_budget
+        self.catalogs = {}
+        self._resident = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, name, path):
+        """
+        Registers a catalog file under name without loading it.
+
+        Returns False, keeping the existing catalog, if name is already taken.
+        """
+        if name in self.catalogs:
+            print(f"WARNING: Catalog name '{name}' is already in use, ignoring {path}")
+            return False
+        self.catalogs[name] = Catalog(name, path)
+        return True
+
+    def register_mapped(self, name, path, source_path=None):
+        """Registers a packed catalog file (see write_packed_catalog) under name."""
+        self.catalogs[name] = MappedCatalog(name, path, source_path)
+
+    def register_directory(self, directory):
+        """Registers every *.json file in directory as a catalog named after the file."""
+        for file_name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, file_name)
+            if os.path.isfile(path) and file_name.lower().endswith('.json'):
+                self.register(os.path.splitext(file_name)[0], path)
+
+    @property
+    def memory_used(self):
+        return sum(catalog.memory_size for catalog in self._resident.values())
+
+    def get(self, name):
+        """Returns the loaded catalog called name, or None if no such catalog is registered."""
+        catalog = self.catalogs.get(name)
+        if catalog is None:
+            return None
+        self._acquire(catalog)
+        return catalog
+
+    def search(self, name, term, limit=DEFAULT_SEARCH_LIMIT):
+        """Searches the catalog called name, or returns None if no such catalog is registered."""
+        catalog = self.catalogs.get(name)
+        if catalog is None:
+            return None
+        # Hold on to the index so a concurrent eviction can't pull it out mid-search
+        index = self._acquire(catalog)
+        return catalog.search_index(index, term, limit)
+
+    def _acquire(self, catalog):
+        """Loads or reloads catalog if needed, marks it most recently used and returns its index."""
+        # Loading happens under the catalog's own lock, so other catalogs stay searchable
+        with catalog.lock:
+            if not catalog.loaded or catalog.is_stale():
+                reloading = catalog.loaded
+                catalog.load()
+                action = "Reloaded" if reloading else "Loaded"
+                print(f"{action} catalog '{catalog.name}' ({len(catalog)} items, ~{catalog.memory_size // 1024} KiB)")
+            index = catalog.index
+        with self._lock:
+            self._resident[catalog.name] = catalog
+            self._resident.move_to_end(catalog.name)
+            self._evict(keep=catalog.name)
+        return index
+
+    def _evict(self, keep):
+        for name, catalog in list(self._resident.items()):
+            if self.memory_used <= self.memory_budget:
+                break
+            # Skip the catalog in use and any that is busy loading right now
+            if name == keep or not catalog.lock.acquire(blocking=False):
+                continue
+            try:
+                del self._resident[name]
+                catalog.unload()
+            finally:
+                catalog.lock.release()
+            print(f"Evicted catalog '{name}' to stay within the memory budget")
@@ -0,0 +1,276 @@
+import argparse
+import os
+import shutil
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import time
+from .catalog import read_items, write_packed_catalog, DEFAULT_MEMORY_BUDGET
+from .server_manager import ServerManager, DEFAULT_CATALOG
+from .utils import get_local_ip
+
+# Ports tried after the requested one before falling back to any free port
+PORT_ATTEMPTS = 10
+MAX_PORT = 65535
+# A worker that dies sooner than this after starting delays its restart
+MIN_WORKER_UPTIME = 1.0
+
+
+class ReusePortTCPServer(socketserver.TCPServer):
+    """TCPServer that lets several processes listen on the same port."""
+
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def server_bind(self):
+        # On Linux the kernel spreads incoming connections across all sockets bound this way
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+class ThreadingReusePortTCPServer(socketserver.ThreadingMixIn, ReusePortTCPServer):
+    """ReusePortTCPServer with a thread per connection, for keep-alive workers."""
+
+    daemon_threads = True
+
+
+def _port_is_free(host, port):
+    """Checks port with a plain bind, which fails if anything listens there, SO_REUSEPORT or not."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        # SO_REUSEADDR only lets the bind past TIME_WAIT leftovers, not a live listener
+        probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            probe.bind((host, port))
+        except OSError:
+            return False
+    return True
+
+
+def _reserve_port(host, preferred):
+    """
+    Binds a SO_REUSEPORT socket on preferred, or the next free port, or any free port.
+
+    The socket never listens, so it receives no connections, but while it stays
+    open no program without SO_REUSEPORT can take the port from under the
+    workers. Each candidate is checked with a plain bind first, so a port that
+    another SO_REUSEPORT server (such as a second instance) listens on counts as busy.
+    """
+    candidates = [p for p in range(preferred, preferred + PORT_ATTEMPTS) if 0 < p <= MAX_PORT]
+    for port in candidates + [0]:
+        if port and not _port_is_free(host, port):
+            continue
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        try:
+            sock.bind((host, port))
+        except (OSError, OverflowError):
+            sock.close()
+            continue
+        if port != preferred:
+            print(f"Port {preferred} is busy, using port {sock.getsockname()[1]} instead")
+        return sock
+    raise OSError(f"No free port found near {preferred}")
+
+
+class MultiProcessServer:
+    """
+    Serves the web UI from several forked worker processes on one port.
+
+    Each worker binds its own SO_REUSEPORT socket, so the kernel balances
+    connections between them and no worker is limited by another's GIL. The
+    default catalog is packed into a file the workers memory-map, so they all
+    share one copy in the page cache. Other named catalogs are still loaded
+    lazily by each worker on its own. Workers that crash are restarted.
+
+    Requires a POSIX system with os.fork and SO_REUSEPORT. Only Linux balances
+    connections across SO_REUSEPORT listeners; on macOS and the BSDs one socket
+    receives every connection, so extra workers only serve as standbys.
+    """
+
+    def __init__(self, workers=None, port=8000, host="", **server_options):
+        """Initializes the MultiProcessServer. server_options are passed to ServerManager."""
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.host = host
+        self.manager = ServerManager(port=port, **server_options)
+        self.port = port
+        self.worker_pids = {}  # pid -> (slot, start time)
+        self.running = False
+        self._reservation = None
+        self._packed_dir = None
+        self.handler = None
+
+    def _share_default_catalog(self):
+        """Packs the default catalog into a file every worker maps instead of loading it."""
+        catalog = self.manager.catalogs.catalogs[DEFAULT_CATALOG]
+        try:
+            items = read_items(catalog.path, DEFAULT_CATALOG)
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Could not share the default catalog, workers will load it themselves: {e}")
+            return
+        self._packed_dir = tempfile.mkdtemp(prefix="work-gui-catalog-")
+        packed_path = os.path.join(self._packed_dir, f"{DEFAULT_CATALOG}.catalog")
+        write_packed_catalog(items, packed_path)
+        self.manager.catalogs.register_mapped(DEFAULT_CATALOG, packed_path, catalog.path)
+
+    def _spawn(self, slot, handler):
+        sys.stdout.flush() # Otherwise the worker inherits and re-prints buffered output
+        pid = os.fork()
+        if pid:
+            self.worker_pids[pid] = (slot, time.monotonic())
+            return
+        # --- Worker process: never returns into the supervisor's code ---
+        exit_code = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_IGN) # The supervisor handles Ctrl+C
+            self._reservation.close()
+            server_class = ThreadingReusePortTCPServer if self.manager.keep_alive else ReusePortTCPServer
+            httpd = server_class((self.host, self.port), handler)
+            httpd.serve_forever()
+        except BaseException as e:
+            print(f"Worker {slot} (pid {os.getpid()}) failed: {e}")
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            os._exit(exit_code)
+
+    def start(self):
+        """Picks a port, prepares the shared catalog and forks the workers."""
+        if not (hasattr(os, "fork") and hasattr(socket, "SO_REUSEPORT")):
+            print("ERROR: Multi-process serving needs os.fork and SO_REUSEPORT, which this platform lacks")
+            return False
+        if not os.path.isdir(self.manager.serve_directory):
+            print("Cannot start server: Serve directory is invalid.")
+            return False
+        if self.workers < 1:
+            print(f"ERROR: Need at least one worker process, got {self.workers}")
+            return False
+        if not 0 <= self.port <= MAX_PORT:
+            print(f"ERROR: Port must be between 0 and {MAX_PORT}, got {self.port}")
+            return False
+        if self.workers > 1 and not sys.platform.startswith("linux"):
+            print("WARNING: Only Linux spreads connections across SO_REUSEPORT workers; "
+                  "on this platform one worker will handle every connection")
+
+        try:
+            self._reservation = _reserve_port(self.host, self.port)
+        except OSError as e:
+            print(f"ERROR starting server: {e}")
+            return False
+        self.port = self._reservation.getsockname()[1]
+        self.manager.port = self.port
+
+        self._share_default_catalog()
+        # Built once here so the bundle is shared copy-on-write with every worker
+        self.handler = self.manager.make_handler()
+        self.running = True
+        for slot in range(self.workers):
+            self._spawn(slot, self.handler)
+
+        print(f"Server started on port {self.port} with {self.workers} worker processes")
+        local_ip = get_local_ip()
+        if local_ip:
+            print(f"Access it at http://{local_ip}:{self.port} or http://localhost:{self.port}")
+        else:
+            print(f"Access it at http://localhost:{self.port}")
+        return True
+
+    def supervise(self):
+        """Waits on the workers, restarting any that exit, until stop() is called."""
+        while self.running:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            if pid not in self.worker_pids:
+                continue
+            slot, started = self.worker_pids.pop(pid)
+            if not self.running:
+                continue
+            exit_code = os.waitstatus_to_exitcode(status)
+            if exit_code < 0:
+                reason = f"was killed by {signal.Signals(-exit_code).name}"
+            else:
+                reason = f"exited with code {exit_code}"
+            print(f"Worker {slot} (pid {pid}) {reason}, restarting")
+            if time.monotonic() - started < MIN_WORKER_UPTIME:
+                time.sleep(MIN_WORKER_UPTIME) # Don't spin if the worker dies on startup
+            if self.running:
+                self._spawn(slot, self.handler)
+
+    def stop(self, *_):
+        """Stops all workers and releases the port. Usable as a signal handler."""
+        if not self.running:
+            return
+        print("Stopping server...")
+        self.running = False
+        for pid in list(self.worker_pids):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in list(self.worker_pids):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.worker_pids.clear()
+        if self._reservation:
+            self._reservation.close()
+        if self._packed_dir:
+            shutil.rmtree(self._packed_dir, ignore_errors=True)
+        print("Server stopped")
+
+    def serve_forever(self):
+        """Starts the workers and supervises them until SIGTERM or Ctrl+C."""
+        if not self.start():
+            return False
+        signal.signal(signal.SIGTERM, self.stop)
+        try:
+            self.supervise()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+        return True
+
+
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def main(argv=None):
+    """Runs the headless multi-process server."""
+    parser = argparse.ArgumentParser(
+        prog="python -m core.multiprocess_server",
+        description="Serve the catalog UI and search API from several worker processes.",
+    )
+    parser.add_argument("--workers", type=_positive_int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--port", type=int, default=8000, help="Preferred port; the next free one is used if busy")
+    parser.add_argument("--host", default="", help="Address to bind (default: all interfaces)")
+    parser.add_argument("--catalog-dir", help="Directory whose *.json files are served as /c/<name>/")
+    parser.add_argument("--memory-budget", type=int, default=DEFAULT_MEMORY_BUDGET // (1024 * 1024),
+                        help="Per-worker memory budget for named catalogs, in MiB")
+    parser.add_argument("--no-bundle", action="store_true", help="Serve index.html and its assets unbundled")
+    args = parser.parse_args(argv)
+
+    server = MultiProcessServer(
+        workers=args.workers,
+        port=args.port,
+        host=args.host,
+        bundle=not args.no_bundle,
+        catalog_dir=args.catalog_dir,
+        catalog_memory_budget=args.memory_budget * 1024 * 1024,
+    )
+    return 0 if server.serve_forever() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
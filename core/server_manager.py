@@ -3,27 +3,137 @@ import socketserver
 import threading
 import os
 import functools # Import functools
+import json
+from urllib.parse import urlsplit, parse_qs, unquote
+from .bundler import AssetBundler
+from .catalog import CatalogRegistry, DEFAULT_MEMORY_BUDGET, DEFAULT_SEARCH_LIMIT
 from .utils import get_local_ip # Keep your relative import
 
+# Catalog served from the web directory's own items.json at /api/search
+DEFAULT_CATALOG = 'default'
+# Upper bound on the ?limit= a client may ask /api/search for
+MAX_SEARCH_LIMIT = 500
+
 # Define the handler class globally
 class CustomHandler(http.server.SimpleHTTPRequestHandler):
     # The 'directory' argument will be passed via functools.partial later
     # The parent __init__ will store it in self.directory
 
+    def __init__(self, *args, bundler=None, catalogs=None, **kwargs):
+        # Must be set before the parent __init__, which handles the request immediately
+        self.bundler = bundler
+        self.catalogs = catalogs
+        super().__init__(*args, **kwargs)
+
+    def send_json(self, data, status=200):
+        """Serves data encoded as a JSON response."""
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_search(self, catalog_name, query):
+        """Serves /api/search?q=...&limit=... for the named catalog."""
+        params = parse_qs(query)
+        term = params.get('q', [''])[0]
+        try:
+            limit = int(params.get('limit', [DEFAULT_SEARCH_LIMIT])[0])
+        except ValueError:
+            self.send_error(400, "Invalid limit")
+            return
+        limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+        try:
+            results = self.catalogs.search(catalog_name, term, limit)
+        except (OSError, ValueError) as e:
+            print(f"Error loading catalog '{catalog_name}': {e}")
+            self.send_error(500, f"Error loading catalog: {e}")
+            return
+        if results is None:
+            self.send_error(404, "Catalog Not Found")
+            return
+        self.send_json(results)
+
+    def send_catalog_route(self, route, query):
+        """Serves /c/<name>/..., the search API and web UI for a named catalog."""
+        name, _, rest = route.partition('/')
+        name = unquote(name) # Catalogs named after files may contain spaces etc.
+        if not self.catalogs or name not in self.catalogs.catalogs:
+            self.send_error(404, "Catalog Not Found")
+        elif rest == 'api/search':
+            self.send_search(name, query)
+        elif rest == 'items.json':
+            # The UI fetches items.json relative to the page, so hand it this catalog's file
+            source_path = self.catalogs.catalogs[name].source_path
+            if not source_path:
+                self.send_error(404, "Catalog Source Not Available")
+                return
+            try:
+                with open(source_path, 'rb') as f:
+                    body = f.read()
+            except OSError as e:
+                print(f"Error reading catalog '{name}': {e}")
+                self.send_error(500, f"Error reading catalog: {e}")
+                return
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif rest in ('', 'index.html'):
+            # Unbundled page: the bundle preloads the default catalog's items
+            self.path = '/index.html'
+            super().do_GET()
+        else:
+            self.path = '/' + rest
+            super().do_GET()
+
+    def send_bundle(self):
+        """Serves the in-memory bundled index.html."""
+        try:
+            body = self.bundler.get_bundle()
+        except (OSError, ValueError) as e:
+            print(f"Error building bundle: {e}")
+            self.send_error(500, f"Error building bundle: {e}")
+            return
+        self.send_response(200)
+        self.send_header('Content-type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
     def do_GET(self):
         # Access the directory the handler was initialized with
         serve_dir = self.directory
+        url = urlsplit(self.path)
+
+        if url.path == '/api/search' and self.catalogs:
+            self.send_search(DEFAULT_CATALOG, url.query)
+
+        elif url.path.startswith('/c/'):
+            route = url.path[len('/c/'):]
+            if '/' not in route:
+                # Redirect so the page's relative links resolve inside the catalog
+                self.send_response(301)
+                self.send_header('Location', url.path + '/')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_catalog_route(route, url.query)
 
-        if self.path == '/favicon.ico':
+        elif self.path == '/favicon.ico':
             # Construct the absolute path to the favicon
             favicon_path = os.path.join(serve_dir, 'assets', 'favicon.ico')
             if os.path.isfile(favicon_path): # Check if the file exists
                 try:
                     with open(favicon_path, 'rb') as f:
+                        body = f.read()
                         self.send_response(200)
                         self.send_header('Content-type', 'image/x-icon')
+                        self.send_header('Content-Length', str(len(body)))
                         self.end_headers()
-                        self.wfile.write(f.read())
+                        self.wfile.write(body)
                 except IOError as e:
                     print(f"Error reading favicon: {e}")
                     self.send_error(500, f"Error reading favicon: {e}")
@@ -33,6 +143,10 @@ class CustomHandler(http.server.SimpleHTTPRequestHandler):
             # Return here to prevent falling through to the default handler
             return
 
+        elif self.path in ('/', '/index.html') and self.bundler:
+            # Single-request first paint: CSS, JS, small assets and items inlined
+            self.send_bundle()
+
         elif self.path == '/':
             # Point to index.html within the specified directory
             self.path = '/index.html'
@@ -45,12 +159,38 @@ class CustomHandler(http.server.SimpleHTTPRequestHandler):
             # (like CSS, JS in assets) from the correct 'directory'.
             super().do_GET()
 
+class KeepAliveHandler(CustomHandler):
+    """CustomHandler that keeps connections open between requests (HTTP/1.1)."""
+    # Every response path sends Content-Length, which persistent connections rely on
+    protocol_version = 'HTTP/1.1'
+    # Idle connections are dropped after this many seconds, freeing their thread
+    timeout = 30
+    # Headers and body go out in separate writes; without this Nagle stalls each response
+    disable_nagle_algorithm = True
+
+class KeepAliveTCPServer(socketserver.ThreadingTCPServer):
+    """One thread per connection, so one persistent client can't hold up the rest."""
+    daemon_threads = True
+
 class ServerManager:
     """Manages the local HTTP server."""
 
-    def __init__(self, port=8000):
-        """Initializes the ServerManager."""
+    def __init__(self, port=8000, bundle=True, catalogs=None, catalog_dir=None,
+                 catalog_memory_budget=DEFAULT_MEMORY_BUDGET, host="", keep_alive=False):
+        """
+        Initializes the ServerManager.
+
+        catalogs maps names to items.json style files and catalog_dir is a
+        directory whose *.json files are each mounted under their file name.
+        Every catalog is served at /c/<name>/ and indexed on first use. The
+        name 'default' is reserved for the web directory's own items.json, and
+        a name that is already taken is skipped with a warning.
+        host is the address to bind ("" for all interfaces). keep_alive serves
+        HTTP/1.1 persistent connections, each on its own thread.
+        """
+        self.host = host
         self.port = port
+        self.keep_alive = keep_alive
         self.httpd = None
         self.server_thread = None
         # --- Determine the directory to serve ---
@@ -65,7 +205,37 @@ class ServerManager:
             print(f"ERROR: Serve directory does not exist: {self.serve_directory}")
         elif not os.path.isfile(os.path.join(self.serve_directory, "index.html")):
              print(f"WARNING: index.html not found in {self.serve_directory}")
+        # --- Bundled index.html (rebuilt automatically when a source file changes) ---
+        self.bundler = AssetBundler(self.serve_directory) if bundle else None
+        # --- Named catalogs (loaded lazily, evicted LRU under the memory budget) ---
+        self.catalogs = CatalogRegistry(catalog_memory_budget)
+        self.catalogs.register(DEFAULT_CATALOG, os.path.join(self.serve_directory, 'items.json'))
+        if catalog_dir:
+            if os.path.isdir(catalog_dir):
+                self.catalogs.register_directory(catalog_dir)
+            else:
+                print(f"WARNING: Catalog directory does not exist: {catalog_dir}")
+        for name, path in (catalogs or {}).items():
+            self.catalogs.register(name, path)
+
 
+    def make_handler(self):
+        """Builds the request handler factory, building the bundle first if enabled."""
+        if self.bundler:
+            # Build up front so the first request doesn't pay for it
+            try:
+                self.bundler.get_bundle()
+            except (OSError, ValueError) as e:
+                print(f"WARNING: Could not bundle index.html, serving files unbundled: {e}")
+                self.bundler = None
+
+        # --- Use functools.partial to create a handler factory ---
+        # This creates a new handler class on the fly that has the 'directory' argument preset
+        handler_class = KeepAliveHandler if self.keep_alive else CustomHandler
+        return functools.partial(
+            handler_class, directory=self.serve_directory, bundler=self.bundler,
+            catalogs=self.catalogs
+        )
 
     def start_server(self):
         """Starts the local HTTP server in a separate thread."""
@@ -73,13 +243,13 @@ class ServerManager:
              print("Cannot start server: Serve directory is invalid.")
              return # Don't start if the directory is wrong
 
-        # --- Use functools.partial to create a handler factory ---
-        # This creates a new handler class on the fly that has the 'directory' argument preset
-        HandlerWithDirectory = functools.partial(CustomHandler, directory=self.serve_directory)
+        HandlerWithDirectory = self.make_handler()
 
         try:
             # Use the factory to create handler instances
-            self.httpd = socketserver.TCPServer(("", self.port), HandlerWithDirectory)
+            server_class = KeepAliveTCPServer if self.keep_alive else socketserver.TCPServer
+            self.httpd = server_class((self.host, self.port), HandlerWithDirectory)
+            self.port = self.httpd.server_address[1] # Actual port when 0 (any free port) was asked for
 
             self.server_thread = threading.Thread(target=self.httpd.serve_forever)
             self.server_thread.daemon = True # Allow the main thread to exit
@@ -88,7 +258,9 @@ class ServerManager:
             print(f"Server started on port {self.port}")
             print(f"Serving directory: {self.serve_directory}")
             local_ip = get_local_ip()
-            if local_ip:
+            if self.host:
+                print(f"Access it at http://{self.host}:{self.port}")
+            elif local_ip:
                 print(f"Access it at http://{local_ip}:{self.port} or http://localhost:{self.port}")
             else:
                 print(f"Access it at http://localhost:{self.port}")
@@ -35,6 +35,13 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // --- Fetch Item Data ---
 async function loadItems() {
+    // The bundled page embeds the first page of items so search works before any fetch
+    const preloaded = window.PRELOADED_ITEMS;
+    if (preloaded) {
+        allItems = preloaded.items;
+        filteredItems = allItems;
+        if (preloaded.complete) return; // Whole catalog was embedded, nothing to fetch
+    }
     try {
         const response = await fetch('items.json');
         if (!response.ok) {